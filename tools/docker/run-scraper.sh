@@ -12,6 +12,8 @@ SCRAPER_LIMIT="${SCRAPER_LIMIT:-}"
 SCRAPER_OFFSET="${SCRAPER_OFFSET:-}"
 SCRAPER_SHARD_SIZE="${SCRAPER_SHARD_SIZE:-}"
 SCRAPER_APPIDS="${SCRAPER_APPIDS:-}"
+SCRAPER_BUILD_WORKERS="${SCRAPER_BUILD_WORKERS:-}"
+SCRAPER_INCLUDE_RAW_HTML="${SCRAPER_INCLUDE_RAW_HTML:-0}"
 RUN_INTERVAL_SECONDS="${RUN_INTERVAL_SECONDS:-0}"
 
 run_once() {
@@ -51,6 +53,14 @@ run_once() {
     set -- "$@" --appids "$SCRAPER_APPIDS"
   fi
 
+  if [ -n "$SCRAPER_BUILD_WORKERS" ]; then
+    set -- "$@" --build-workers "$SCRAPER_BUILD_WORKERS"
+  fi
+
+  if [ "$SCRAPER_INCLUDE_RAW_HTML" = "1" ]; then
+    set -- "$@" --include-raw-html
+  fi
+
   "$@"
 }
 
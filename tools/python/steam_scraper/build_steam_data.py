@@ -1,17 +1,28 @@
 from __future__ import annotations
 
-from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
 from dataclasses import dataclass
 import argparse
+import base64
+import http.client
 import json
+import os
 from pathlib import Path
+import shutil
+import threading
 import time
-from typing import Iterable
-from urllib.error import HTTPError, URLError
-from urllib.request import Request, urlopen
+from typing import Iterable, Iterator
+from urllib.error import HTTPError
+from urllib.parse import unquote, urljoin, urlsplit
+from urllib.request import getproxies, proxy_bypass
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 from steam_scraper.component_matcher import annotate_requirement_components, load_catalogs
-from steam_scraper.requirements_parser import clean_text, has_useful_requirement, parse_requirements_field
+from steam_scraper.requirements_parser import clean_text, has_requirement_markup, has_useful_requirement, parse_requirements_field
 
 
 APP_LIST_URLS = [
@@ -24,10 +35,17 @@ APP_LIST_MIRROR_URLS = [
     "https://raw.githubusercontent.com/jsnli/steamappidlist/master/data/software_appid.json",
 ]
 APP_DETAILS_URL = "https://store.steampowered.com/api/appdetails?appids={appid}&l=english&cc=us"
+USER_AGENT = "steamspecs-python-scraper/1.0"
+REQUEST_TIMEOUT_SECONDS = 20
+MAX_REDIRECTS = 5
 DEFAULT_CONCURRENCY = 4
 DEFAULT_SHARD_SIZE = 2000
 DEFAULT_DISCOVER_WINDOW = 2000
 DEFAULT_DISCOVER_MISS_LIMIT = 400
+DISCOVERY_STATE_SAVE_INTERVAL = 25
+WORKER_START_STAGGER_SECONDS = 0.1
+DEFAULT_BUILD_WORKERS = min(4, len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1)
+BUILD_CHUNK_SIZE = 32
 ALLOWED_TYPES = {"game", "dlc", "software"}
 
 
@@ -50,6 +68,8 @@ class Args:
     request_delay_ms: int
     retry_failed: bool
     fresh_start: bool
+    build_workers: int
+    include_raw_html: bool
 
 
 def parse_args() -> Args:
@@ -71,6 +91,8 @@ def parse_args() -> Args:
     parser.add_argument("--request-delay-ms", type=int, default=75)
     parser.add_argument("--no-retry-failed", action="store_true")
     parser.add_argument("--fresh-start", action="store_true")
+    parser.add_argument("--build-workers", type=int, default=DEFAULT_BUILD_WORKERS)
+    parser.add_argument("--include-raw-html", action="store_true", help="Keep Steam's raw requirement HTML in shard output")
     ns = parser.parse_args()
 
     appids = None
@@ -95,6 +117,8 @@ def parse_args() -> Args:
         request_delay_ms=max(0, ns.request_delay_ms),
         retry_failed=not ns.no_retry_failed,
         fresh_start=ns.fresh_start,
+        build_workers=max(1, ns.build_workers),
+        include_raw_html=ns.include_raw_html,
     )
 
 
@@ -102,13 +126,36 @@ def ensure_dir(path: Path) -> None:
     path.mkdir(parents=True, exist_ok=True)
 
 
+def decode_json(raw: bytes):
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            # e.g. lone surrogate escapes, which json.loads accepts.
+            pass
+    return json.loads(raw.decode("utf-8"))
+
+
+def encode_json(value) -> bytes:
+    if orjson is not None:
+        try:
+            return orjson.dumps(value, option=orjson.OPT_INDENT_2)
+        except orjson.JSONEncodeError:
+            pass
+    try:
+        return json.dumps(value, indent=2, ensure_ascii=False).encode("utf-8")
+    except UnicodeEncodeError:
+        # Lone surrogates cannot be written as UTF-8; escape them instead.
+        return json.dumps(value, indent=2).encode("utf-8")
+
+
 def read_json(path: Path):
-    return json.loads(path.read_text(encoding="utf-8"))
+    return decode_json(path.read_bytes())
 
 
 def write_json(path: Path, value) -> None:
     ensure_dir(path.parent)
-    path.write_text(json.dumps(value, indent=2), encoding="utf-8")
+    path.write_bytes(encode_json(value))
 
 
 def load_discovery_state(cache_dir: Path) -> dict:
@@ -221,10 +268,101 @@ def dedupe_appids(appids: Iterable[int]) -> list[int]:
     return ordered
 
 
+_connections = threading.local()
+
+
+def get_proxy(scheme: str, netloc: str):
+    # Honour http_proxy/https_proxy/no_proxy the same way urlopen did.
+    proxy = getproxies().get(scheme)
+    if not proxy or proxy_bypass(netloc):
+        return None
+    if "://" not in proxy:
+        proxy = f"http://{proxy}"
+    return urlsplit(proxy)
+
+
+def proxy_auth_headers(proxy) -> dict[str, str]:
+    if proxy.username is None:
+        return {}
+    credentials = f"{unquote(proxy.username)}:{unquote(proxy.password or '')}"
+    return {"Proxy-Authorization": "Basic " + base64.b64encode(credentials.encode("utf-8")).decode("ascii")}
+
+
+def get_connection(scheme: str, netloc: str) -> tuple[http.client.HTTPConnection, dict[str, str], bool, bool]:
+    pool = getattr(_connections, "pool", None)
+    if pool is None:
+        pool = _connections.pool = {}
+
+    pooled = pool.get((scheme, netloc))
+    if pooled is not None:
+        return (*pooled, True)
+
+    connection_class = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+    proxy = get_proxy(scheme, netloc)
+    headers: dict[str, str] = {}
+    absolute_target = False
+    if proxy is None:
+        connection = connection_class(netloc, timeout=REQUEST_TIMEOUT_SECONDS)
+    elif scheme == "https":
+        connection = connection_class(proxy.hostname, proxy.port, timeout=REQUEST_TIMEOUT_SECONDS)
+        connection.set_tunnel(netloc, headers=proxy_auth_headers(proxy))
+    else:
+        connection = http.client.HTTPConnection(proxy.hostname, proxy.port, timeout=REQUEST_TIMEOUT_SECONDS)
+        headers = proxy_auth_headers(proxy)
+        absolute_target = True
+
+    pool[(scheme, netloc)] = (connection, headers, absolute_target)
+    return connection, headers, absolute_target, False
+
+
+def drop_connection(scheme: str, netloc: str) -> None:
+    pooled = _connections.pool.pop((scheme, netloc), None)
+    if pooled is not None:
+        pooled[0].close()
+
+
+def http_get(url: str) -> tuple[http.client.HTTPResponse, bytes]:
+    parts = urlsplit(url)
+    target = parts.path or "/"
+    if parts.query:
+        target = f"{target}?{parts.query}"
+
+    while True:
+        connection, proxy_headers, absolute_target, reused = get_connection(parts.scheme, parts.netloc)
+        try:
+            connection.request(
+                "GET",
+                url if absolute_target else target,
+                headers={"User-Agent": USER_AGENT, **proxy_headers},
+            )
+            response = connection.getresponse()
+            body = response.read()
+        except TimeoutError:
+            drop_connection(parts.scheme, parts.netloc)
+            raise
+        except (OSError, http.client.HTTPException):
+            drop_connection(parts.scheme, parts.netloc)
+            if reused:
+                # The server closed the idle connection; retry once on a fresh one.
+                continue
+            raise
+
+        if response.will_close:
+            drop_connection(parts.scheme, parts.netloc)
+        return response, body
+
+
 def fetch_json(url: str):
-    request = Request(url, headers={"User-Agent": "steamspecs-python-scraper/1.0"})
-    with urlopen(request, timeout=20) as response:
-        return json.loads(response.read().decode("utf-8"))
+    for _ in range(MAX_REDIRECTS + 1):
+        response, body = http_get(url)
+        location = response.getheader("Location")
+        if response.status in (301, 302, 303, 307, 308) and location:
+            url = urljoin(url, location)
+            continue
+        if response.status != 200:
+            raise HTTPError(url, response.status, response.reason, response.headers, None)
+        return decode_json(body)
+    raise HTTPError(url, response.status, "Too many redirects", response.headers, None)
 
 
 def fetch_json_with_retry(url: str, attempts: int = 4, base_sleep: float = 0.8):
@@ -232,7 +370,7 @@ def fetch_json_with_retry(url: str, attempts: int = 4, base_sleep: float = 0.8):
     for attempt in range(1, attempts + 1):
         try:
             return fetch_json(url)
-        except (HTTPError, URLError, TimeoutError, json.JSONDecodeError) as error:
+        except (OSError, http.client.HTTPException, json.JSONDecodeError) as error:
             last_error = error
             if attempt == attempts:
                 break
@@ -359,15 +497,18 @@ def get_app_details(appid: int, cache_dir: Path, refresh: bool):
     return data
 
 
-def normalize_requirement_set(field, catalogs: dict[str, list[dict]]):
+def normalize_requirement_set(field, catalogs: dict[str, list[dict]], include_raw_html: bool = True):
     parsed = parse_requirements_field(field)
+    if not include_raw_html:
+        parsed["minimum"].pop("raw_html", None)
+        parsed["recommended"].pop("raw_html", None)
     return {
         "minimum": annotate_requirement_components(parsed["minimum"], catalogs),
         "recommended": annotate_requirement_components(parsed["recommended"], catalogs),
     }
 
 
-def normalize_app_record(appid: int, payload, catalogs: dict[str, list[dict]]):
+def normalize_app_record(appid: int, payload, catalogs: dict[str, list[dict]], include_raw_html: bool = True):
     entry = payload.get(str(appid)) or payload.get(appid)
     data = entry.get("data") if isinstance(entry, dict) else None
     if not data:
@@ -377,84 +518,184 @@ def normalize_app_record(appid: int, payload, catalogs: dict[str, list[dict]]):
     if app_type not in ALLOWED_TYPES:
         return None
 
-    requirements = {
-        "pc": normalize_requirement_set(data.get("pc_requirements"), catalogs),
-        "mac": normalize_requirement_set(data.get("mac_requirements"), catalogs),
-        "linux": normalize_requirement_set(data.get("linux_requirements"), catalogs),
+    raw_requirements = {
+        "pc": data.get("pc_requirements"),
+        "mac": data.get("mac_requirements"),
+        "linux": data.get("linux_requirements"),
     }
+    requirements = None
+    if any(has_requirement_markup(field) for field in raw_requirements.values()):
+        requirements = {
+            platform: normalize_requirement_set(field, catalogs, include_raw_html)
+            for platform, field in raw_requirements.items()
+        }
 
-    has_requirements = any(
-        has_useful_requirement(levels["minimum"]) or has_useful_requirement(levels["recommended"])
-        for levels in requirements.values()
-    )
+        has_requirements = any(
+            has_useful_requirement(levels["minimum"]) or has_useful_requirement(levels["recommended"])
+            for levels in requirements.values()
+        )
+        if not has_requirements:
+            requirements = None
 
     return {
         "appid": int(appid),
         "name": clean_text(data.get("name")),
         "type": app_type,
-        "requirements": requirements if has_requirements else None,
+        "requirements": requirements,
     }
 
 
-def build_index(apps: list[dict], shard_size: int) -> dict:
-    highest_appid = apps[-1]["appid"] if apps else 0
+def build_index_entry(app: dict) -> dict:
+    return {
+        "appid": app["appid"],
+        "name": app["name"],
+        "type": app["type"],
+        "has_requirements": bool(app["requirements"]),
+    }
+
+
+def build_index(index_apps: list[dict], shard_size: int) -> dict:
+    highest_appid = index_apps[-1]["appid"] if index_apps else 0
     return {
         "version": 2,
         "shard_size": shard_size,
-        "total_apps": len(apps),
-        "total_shards": (highest_appid // shard_size) + 1 if apps else 0,
+        "total_apps": len(index_apps),
+        "total_shards": (highest_appid // shard_size) + 1 if index_apps else 0,
         "generated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
-        "apps": [
-            {
-                "appid": app["appid"],
-                "name": app["name"],
-                "type": app["type"],
-                "has_requirements": bool(app["requirements"]),
-            }
-            for app in apps
-        ],
+        "apps": index_apps,
     }
 
 
-def write_dataset(apps: list[dict], output_dir: Path, shard_size: int) -> None:
+def finish_shard(shard_file, temp_path: Path) -> None:
+    shard_file.write(b"\n]")
+    shard_file.close()
+    os.replace(temp_path, temp_path.with_suffix(""))
+
+
+def stream_shards(apps: Iterable[dict], shards_dir: Path, shard_size: int) -> list[dict]:
+    # Shards are renamed from .tmp only once terminated, never left truncated.
+    index_apps: list[dict] = []
+    shard_id = None
+    shard_file = None
+    shard_temp_path = None
+    try:
+        for app in apps:
+            app_shard_id = app["appid"] // shard_size
+            if shard_id is not None and app_shard_id < shard_id:
+                raise ValueError("apps must be sorted by appid")
+
+            if app_shard_id != shard_id:
+                if shard_file is not None:
+                    finish_shard(shard_file, shard_temp_path)
+                    shard_file = None
+                shard_id = app_shard_id
+                shard_temp_path = shards_dir / f"shard_{shard_id:05d}.json.tmp"
+                shard_file = shard_temp_path.open("wb")
+                shard_file.write(b"[\n  ")
+            else:
+                shard_file.write(b",\n  ")
+
+            shard_file.write(encode_json(app).replace(b"\n", b"\n  "))
+            index_apps.append(build_index_entry(app))
+
+        if shard_file is not None:
+            finish_shard(shard_file, shard_temp_path)
+            shard_file = None
+    finally:
+        if shard_file is not None:
+            shard_file.close()
+            shard_temp_path.unlink(missing_ok=True)
+
+    return index_apps
+
+
+def write_dataset(apps: Iterable[dict], output_dir: Path, shard_size: int) -> int:
     shards_dir = output_dir / "shards"
+    staging_dir = output_dir / "shards.tmp"
+    index_path = output_dir / "index.json"
+    index_temp_path = output_dir / "index.json.tmp"
     ensure_dir(shards_dir)
 
-    if shards_dir.exists():
-        for shard_file in shards_dir.glob("shard_*.json"):
+    if staging_dir.exists():
+        shutil.rmtree(staging_dir)
+    ensure_dir(staging_dir)
+
+    # Nothing published is touched until every record has been staged.
+    try:
+        index_apps = stream_shards(apps, staging_dir, shard_size)
+        index_temp_path.write_bytes(encode_json(build_index(index_apps, shard_size)))
+    except BaseException:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        index_temp_path.unlink(missing_ok=True)
+        raise
+
+    staged_names = set()
+    for staged_file in sorted(staging_dir.glob("shard_*.json")):
+        os.replace(staged_file, shards_dir / staged_file.name)
+        staged_names.add(staged_file.name)
+
+    for shard_file in shards_dir.glob("shard_*.json"):
+        if shard_file.name not in staged_names:
             shard_file.unlink()
 
-    shard_map: dict[int, list[dict]] = {}
-    for app in apps:
-        shard_id = app["appid"] // shard_size
-        shard_map.setdefault(shard_id, []).append(app)
+    os.replace(index_temp_path, index_path)
+    staging_dir.rmdir()
+    return len(index_apps)
+
 
-    for shard_id, shard_apps in shard_map.items():
-        write_json(shards_dir / f"shard_{shard_id:05d}.json", shard_apps)
+_build_worker_catalogs: dict[str, list[dict]] | None = None
+_build_worker_include_raw_html = True
 
-    write_json(output_dir / "index.json", build_index(apps, shard_size))
 
+def init_build_worker(catalogs: dict[str, list[dict]], include_raw_html: bool) -> None:
+    global _build_worker_catalogs, _build_worker_include_raw_html
+    _build_worker_catalogs = catalogs
+    _build_worker_include_raw_html = include_raw_html
 
-def collect_cached_apps(cache_dir: Path, catalogs: dict[str, list[dict]], selected_appids: Iterable[int] | None = None) -> list[dict]:
+
+def normalize_cached_app(cached: tuple[int, Path]) -> dict | None:
+    appid, file_path = cached
+    return normalize_app_record(appid, read_json(file_path), _build_worker_catalogs, _build_worker_include_raw_html)
+
+
+def iter_cached_apps(
+    cache_dir: Path,
+    catalogs: dict[str, list[dict]],
+    selected_appids: Iterable[int] | None = None,
+    build_workers: int = 1,
+    include_raw_html: bool = True,
+) -> Iterator[dict]:
     details_dir = cache_dir / "appdetails"
     if not details_dir.exists():
-        return []
+        return
 
     allowed = set(selected_appids) if selected_appids is not None else None
-    apps: list[dict] = []
-
-    for file_path in sorted(details_dir.glob("*.json")):
-        appid = int(file_path.stem)
-        if allowed is not None and appid not in allowed:
-            continue
-
-        payload = read_json(file_path)
-        record = normalize_app_record(appid, payload, catalogs)
-        if record:
-            apps.append(record)
+    cached = sorted(
+        (int(file_path.stem), file_path)
+        for file_path in details_dir.glob("*.json")
+    )
+    if allowed is not None:
+        cached = [(appid, file_path) for appid, file_path in cached if appid in allowed]
+
+    if build_workers <= 1 or len(cached) <= BUILD_CHUNK_SIZE:
+        for appid, file_path in cached:
+            record = normalize_app_record(appid, read_json(file_path), catalogs, include_raw_html)
+            if record:
+                yield record
+        return
 
-    apps.sort(key=lambda app: app["appid"])
-    return apps
+    executor = ProcessPoolExecutor(
+        max_workers=build_workers,
+        initializer=init_build_worker,
+        initargs=(catalogs, include_raw_html),
+    )
+    try:
+        for record in executor.map(normalize_cached_app, cached, chunksize=BUILD_CHUNK_SIZE):
+            if record:
+                yield record
+    finally:
+        # map() submits every chunk up front; drop those nobody will read.
+        executor.shutdown(wait=True, cancel_futures=True)
 
 
 def scrape_app_details(appids: list[int], args: Args, skipped_cached: int = 0) -> None:
@@ -480,8 +721,10 @@ def scrape_app_details(appids: list[int], args: Args, skipped_cached: int = 0) -
             "rate_limited": rate_limited,
         })
 
-    def worker(appid: int) -> dict:
+    def worker(appid: int, position: int) -> dict:
         try:
+            if position < args.concurrency:
+                time.sleep(position * WORKER_START_STAGGER_SECONDS)
             if args.request_delay_ms:
                 time.sleep(args.request_delay_ms / 1000)
             get_app_details(appid, args.cache_dir, args.refresh)
@@ -492,7 +735,7 @@ def scrape_app_details(appids: list[int], args: Args, skipped_cached: int = 0) -
     write_progress("running")
 
     with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
-        pending = {executor.submit(worker, appid): appid for appid in appids}
+        pending = {executor.submit(worker, appid, position): appid for position, appid in enumerate(appids)}
 
         while pending:
             done, not_done = wait(pending.keys(), timeout=5, return_when=FIRST_COMPLETED)
@@ -507,6 +750,7 @@ def scrape_app_details(appids: list[int], args: Args, skipped_cached: int = 0) -
                 )
                 continue
 
+            batch_timestamp = utc_timestamp()
             for future in done:
                 result = future.result()
                 pending.pop(future, None)
@@ -521,7 +765,7 @@ def scrape_app_details(appids: list[int], args: Args, skipped_cached: int = 0) -
                         "appid": result["appid"],
                         "error": result["error"],
                         "attempts": int(previous.get("attempts") or 0) + 1,
-                        "last_attempted_at": utc_timestamp(),
+                        "last_attempted_at": batch_timestamp,
                     }
                 else:
                     failed_map.pop(result["appid"], None)
@@ -544,6 +788,20 @@ def scrape_app_details(appids: list[int], args: Args, skipped_cached: int = 0) -
     if failed:
         print(f"Saved {len(failed_map)} failed app detail fetches to {args.cache_dir / 'failed-appdetails.json'}")
 
+def iter_discovery_payloads(appids: range, args: Args) -> Iterator[tuple[int, dict | None, Exception | None]]:
+    def fetch(appid: int) -> tuple[int, dict | None, Exception | None]:
+        try:
+            if args.request_delay_ms:
+                time.sleep(args.request_delay_ms / 1000)
+            return appid, get_app_details(appid, args.cache_dir, False), None
+        except Exception as error:
+            return appid, None, error
+
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        for batch_start in range(0, len(appids), args.concurrency):
+            yield from executor.map(fetch, appids[batch_start:batch_start + args.concurrency])
+
+
 def discover_new_appids(base_appids: list[int], args: Args, catalogs: dict[str, list[dict]]) -> list[int]:
     if not args.discover:
         return []
@@ -561,12 +819,13 @@ def discover_new_appids(base_appids: list[int], args: Args, catalogs: dict[str,
     discovered_ids: list[int] = []
     consecutive_misses = 0
 
-    for appid in range(start_appid, start_appid + args.discover_window):
+    window = range(start_appid, start_appid + args.discover_window)
+    for checked, (appid, payload, fetch_error) in enumerate(iter_discovery_payloads(window, args), start=1):
         state["last_checked_appid"] = appid
-        save_discovery_state(args.cache_dir, state)
 
         try:
-            payload = get_app_details(appid, args.cache_dir, False)
+            if fetch_error is not None:
+                raise fetch_error
             record = normalize_app_record(appid, payload, catalogs)
         except Exception as error:
             if is_rate_limited_error(error):
@@ -578,6 +837,7 @@ def discover_new_appids(base_appids: list[int], args: Args, catalogs: dict[str,
                 print(f"Discovery paused at appid {appid} due to Steam rate limiting (429).")
                 print("Resume later, or retry with a larger --request-delay-ms.")
                 return discovered_ids
+            save_discovery_state(args.cache_dir, state)
             raise
 
         if record:
@@ -600,8 +860,10 @@ def discover_new_appids(base_appids: list[int], args: Args, catalogs: dict[str,
                 save_discovery_state(args.cache_dir, state)
                 return discovered_ids
 
-        save_discovery_state(args.cache_dir, state)
+        if checked % DISCOVERY_STATE_SAVE_INTERVAL == 0:
+            save_discovery_state(args.cache_dir, state)
 
+    save_discovery_state(args.cache_dir, state)
     print(f"Finished discovery window with {len(discovered_ids)} newly discovered apps")
     return discovered_ids
 
@@ -664,10 +926,11 @@ def main() -> None:
         if scrape_targets:
             scrape_app_details(scrape_targets, args, skipped_cached=skipped_cached)
         else:
+            now = utc_timestamp()
             save_scrape_progress(args.cache_dir, {
                 "status": "completed",
-                "started_at": utc_timestamp(),
-                "updated_at": utc_timestamp(),
+                "started_at": now,
+                "updated_at": now,
                 "target_total": 0,
                 "completed": 0,
                 "failed": 0,
@@ -677,9 +940,15 @@ def main() -> None:
             })
             print("No app detail fetches needed; using cached payloads")
 
-    normalized_apps = collect_cached_apps(args.cache_dir, catalogs, selected_appids)
-    write_dataset(normalized_apps, args.output_dir, args.shard_size)
-    print(f"Wrote {len(normalized_apps)} apps to {args.output_dir}")
+    normalized_apps = iter_cached_apps(
+        args.cache_dir,
+        catalogs,
+        selected_appids,
+        args.build_workers,
+        args.include_raw_html,
+    )
+    written = write_dataset(normalized_apps, args.output_dir, args.shard_size)
+    print(f"Wrote {written} apps to {args.output_dir}")
 
 
 if __name__ == "__main__":
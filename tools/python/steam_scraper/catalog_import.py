@@ -325,12 +325,37 @@ def build_alias_index(store: dict[str, dict]) -> dict[tuple[str, str], str]:
     return index
 
 
-def resolve_component_id(store: dict[str, dict], component: dict) -> str | None:
+def update_alias_index(
+    index: dict[tuple[str, str], str],
+    store: dict[str, dict],
+    positions: dict[str, int],
+    component_id: str,
+) -> None:
+    # Keep the index identical to a fresh build_alias_index(store): when two
+    # components share an alias, the one inserted into the store last wins.
+    component = store[component_id]
+    kind = clean_text(component.get("kind"))
+    if not kind:
+        return
+
+    position = positions.setdefault(component_id, len(positions))
+    for alias in component.get("aliases") or []:
+        owner = index.get((kind, alias))
+        if owner is None or positions[owner] <= position:
+            index[(kind, alias)] = component_id
+
+
+def resolve_component_id(
+    store: dict[str, dict],
+    component: dict,
+    alias_index: dict[tuple[str, str], str] | None = None,
+) -> str | None:
     incoming_id = clean_text(component.get("id"))
     if incoming_id and incoming_id in store:
         return incoming_id
 
-    alias_index = build_alias_index(store)
+    if alias_index is None:
+        alias_index = build_alias_index(store)
     kind = clean_text(component.get("kind"))
     for alias in component.get("aliases") or []:
         found = alias_index.get((kind, alias))
@@ -413,14 +438,20 @@ def map_component_row(row: dict, source: dict) -> dict:
     return component
 
 
-def resolve_score_target(store: dict[str, dict], source: dict, row: dict) -> str | None:
+def resolve_score_target(
+    store: dict[str, dict],
+    source: dict,
+    row: dict,
+    alias_index: dict[tuple[str, str], str] | None = None,
+) -> str | None:
     columns = source.get("columns") or {}
     direct_id = clean_text(read_mapped_value(row, columns.get("id")))
     if direct_id and direct_id in store:
         return direct_id
 
     kind = clean_text(source.get("kind")) or clean_text(read_mapped_value(row, columns.get("kind")))
-    alias_index = build_alias_index(store)
+    if alias_index is None:
+        alias_index = build_alias_index(store)
 
     candidates = []
     for key in ["name", "alias", "model"]:
@@ -444,34 +475,40 @@ def resolve_score_target(store: dict[str, dict], source: dict, row: dict) -> str
 
 def apply_normalized_components(store: dict[str, dict], source: dict, payload) -> int:
     applied = 0
+    alias_index = build_alias_index(store)
+    positions = {component_id: position for position, component_id in enumerate(store)}
     for row in payload:
         component = create_component({
             **row,
             "kind": row.get("kind") or source.get("kind"),
             "sources": [source.get("id")],
         })
-        resolved_id = resolve_component_id(store, component)
+        resolved_id = resolve_component_id(store, component, alias_index)
         if not resolved_id or not component["kind"]:
             continue
 
         component["id"] = resolved_id
         existing = store.get(resolved_id)
         store[resolved_id] = merge_component(existing, component) if existing else component
+        update_alias_index(alias_index, store, positions, resolved_id)
         applied += 1
     return applied
 
 
 def apply_mapped_components(store: dict[str, dict], source: dict, payload) -> int:
     applied = 0
+    alias_index = build_alias_index(store)
+    positions = {component_id: position for position, component_id in enumerate(store)}
     for row in payload:
         component = create_component(map_component_row(row, source))
-        resolved_id = resolve_component_id(store, component)
+        resolved_id = resolve_component_id(store, component, alias_index)
         if not resolved_id or not component["kind"] or not component["name"]:
             continue
 
         component["id"] = resolved_id
         existing = store.get(resolved_id)
         store[resolved_id] = merge_component(existing, component) if existing else component
+        update_alias_index(alias_index, store, positions, resolved_id)
         applied += 1
     return applied
 
@@ -495,9 +532,10 @@ def apply_score_overrides(store: dict[str, dict], source: dict, payload) -> int:
 def apply_mapped_scores(store: dict[str, dict], source: dict, payload) -> int:
     applied = 0
     columns = source.get("columns") or {}
+    alias_index = build_alias_index(store)
 
     for row in payload:
-        target_id = resolve_score_target(store, source, row)
+        target_id = resolve_score_target(store, source, row, alias_index)
         if not target_id or target_id not in store:
             continue
 
@@ -1,11 +1,16 @@
 from __future__ import annotations
 
 import argparse
+from functools import lru_cache
 import json
 from pathlib import Path
 import re
 
 _MIN_SCORE_CACHE: dict[tuple[int, tuple[str, ...]], int | None] = {}
+_ALIAS_TABLE_CACHE: dict[int, list[tuple[dict, tuple[set[str], ...]]]] = {}
+_EXACT_ALIAS_INDEX_CACHE: dict[int, dict[str, list[dict]]] = {}
+_REQUIREMENT_MATCH_CATALOGS: dict[int, list[dict]] = {}
+REQUIREMENT_MATCH_CACHE_SIZE = 4096
 GENERIC_TOKENS = {
     "amd", "intel", "nvidia", "ati", "radeon", "geforce", "video", "graphics", "graphic",
     "card", "gpu", "cpu", "processor", "processors", "series", "support", "supported",
@@ -70,6 +75,37 @@ def load_catalogs(catalog_dir: Path) -> dict[str, list[dict]]:
     }
 
 
+def get_alias_table(catalog: list[dict]) -> list[tuple[dict, tuple[set[str], ...]]]:
+    cache_key = id(catalog)
+    if cache_key in _ALIAS_TABLE_CACHE:
+        return _ALIAS_TABLE_CACHE[cache_key]
+
+    table = []
+    for component in catalog:
+        aliases = component.get("aliases") or []
+        alias_tokens = tuple(normalized_tokens(alias) for alias in aliases if alias)
+        table.append((component, alias_tokens))
+
+    _ALIAS_TABLE_CACHE[cache_key] = table
+    return table
+
+
+def get_exact_alias_index(catalog: list[dict]) -> dict[str, list[dict]]:
+    cache_key = id(catalog)
+    if cache_key in _EXACT_ALIAS_INDEX_CACHE:
+        return _EXACT_ALIAS_INDEX_CACHE[cache_key]
+
+    index: dict[str, list[dict]] = {}
+    for component in catalog:
+        for alias in component.get("aliases") or []:
+            matches = index.setdefault(alias, [])
+            if not matches or matches[-1] is not component:
+                matches.append(component)
+
+    _EXACT_ALIAS_INDEX_CACHE[cache_key] = index
+    return index
+
+
 def find_min_score_by_patterns(catalog: list[dict], patterns: list[str]) -> int | None:
     cache_key = (id(catalog), tuple(patterns))
     if cache_key in _MIN_SCORE_CACHE:
@@ -298,29 +334,21 @@ def match_component_variant(raw_text: str, catalog: list[dict]) -> dict | None:
     if not normalized:
         return None
 
-    exact_matches = []
+    exact_matches = get_exact_alias_index(catalog).get(normalized)
+    if exact_matches:
+        return sorted(exact_matches, key=lambda item: item.get("score") or 0, reverse=True)[0]
+
+    # No component carries this exact alias, so only token overlap is left.
     partial_matches = []
     raw_tokens = normalized_tokens(raw_text)
 
-    for component in catalog:
-        aliases = component.get("aliases") or []
-        if normalized in aliases:
-            exact_matches.append(component)
-            continue
-
-        for alias in aliases:
-            if not alias:
-                continue
-            alias_tokens = normalized_tokens(alias)
+    for component, alias_token_sets in get_alias_table(catalog):
+        for alias_tokens in alias_token_sets:
             overlap = raw_tokens & alias_tokens
             if len(overlap) >= 2 and (len(overlap) / max(1, len(raw_tokens))) >= 0.5:
                 partial_matches.append(component)
                 break
 
-    if exact_matches:
-        exact_matches.sort(key=lambda item: item.get("score") or 0, reverse=True)
-        return exact_matches[0]
-
     if partial_matches:
         partial_matches.sort(key=lambda item: item.get("score") or 0, reverse=True)
         return partial_matches[0]
@@ -398,13 +426,23 @@ def match_component_requirement(raw_text: str | None, catalog: list[dict], kind:
     }
 
 
+@lru_cache(maxsize=REQUIREMENT_MATCH_CACHE_SIZE)
+def match_catalog_requirement(catalog_id: int, kind: str, raw_text: str | None) -> dict:
+    return match_component_requirement(raw_text, _REQUIREMENT_MATCH_CATALOGS[catalog_id], kind)
+
+
+def match_component_requirement_cached(raw_text: str | None, catalog: list[dict], kind: str) -> dict:
+    _REQUIREMENT_MATCH_CATALOGS[id(catalog)] = catalog
+    return match_catalog_requirement(id(catalog), kind, raw_text)
+
+
 def annotate_requirement_components(requirement: dict | None, catalogs: dict[str, list[dict]]) -> dict | None:
     if not requirement:
         return requirement
 
     annotated = dict(requirement)
-    annotated["cpu_match"] = match_component_requirement(annotated.get("cpu"), catalogs.get("cpu", []), "cpu")
-    annotated["gpu_match"] = match_component_requirement(annotated.get("gpu"), catalogs.get("gpu", []), "gpu")
+    annotated["cpu_match"] = match_component_requirement_cached(annotated.get("cpu"), catalogs.get("cpu", []), "cpu")
+    annotated["gpu_match"] = match_component_requirement_cached(annotated.get("gpu"), catalogs.get("gpu", []), "gpu")
     return annotated
 
 
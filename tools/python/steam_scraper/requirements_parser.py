@@ -20,6 +20,27 @@ EMPTY_REQUIREMENT = {
 }
 
 NULLISH_RE = re.compile(r"^(?:n/?a|none|unknown|not available|not applicable|null|nil|tbd|-+)$", re.IGNORECASE)
+INLINE_SPACE_RE = re.compile(r"[ \t]+")
+EXTRA_BLANK_LINES_RE = re.compile(r"\n{3,}")
+# Line-breaking tags are captured in group 1; every other tag is dropped.
+HTML_TAG_RE = re.compile(r"(<br\s*/?>|</p>|</li>|</ul>)|<[^>]+>", re.IGNORECASE)
+LABEL_SEPARATOR_RE = re.compile(r"[^a-z0-9]+")
+SIZE_RE = re.compile(r"(\d+(?:\.\d+)?)\s*(tb|gb|mb)\b")
+GRAPHICS_MEMORY_RE = re.compile(r"\b(vram|video memory|video card|graphics|graphic card|dedicated)\b")
+GRAPHICS_API_RE = re.compile(r"(?:directx|direct3d)\s*([0-9]+(?:\.[0-9]+)?)|opengl\s*([0-9]+(?:\.[0-9]+)?)", re.IGNORECASE)
+VULKAN_RE = re.compile(r"\bvulkan\b", re.IGNORECASE)
+OS_HINT_RE = re.compile(r"windows|linux|ubuntu|steamos|mac ?os|os x|sierra|mojave|catalina|ventura", re.IGNORECASE)
+CPU_HINT_RE = re.compile(r"processor|cpu|intel|amd|ryzen|athlon|pentium|celeron|xeon|core [im\d]|dual[\s-]?core|quad[\s-]?core|ghz|mhz", re.IGNORECASE)
+GPU_HINT_RE = re.compile(r"graphics|gpu|video card|video memory|vram|geforce|radeon|gtx|rtx|rx\s*\d|intel hd|iris|arc|nvidia|amd hd|directx|direct3d|opengl|shader|pci|agp", re.IGNORECASE)
+RAM_HINT_RE = re.compile(r"\b(memory|ram)\b", re.IGNORECASE)
+STORAGE_HINT_RE = re.compile(r"storage|hard drive|hard disk|disk space|drive space|available space|free space", re.IGNORECASE)
+LEVEL_HEADING_RE = re.compile(r"(?:<strong>\s*)?(Minimum|Recommended)\s*:?\s*(?:</strong>)?", re.IGNORECASE)
+# An optional "Minimum:"/"Recommended:" prefix, then an optional "Label: value".
+REQUIREMENT_LINE_RE = re.compile(
+    r"(?P<level>(?:minimum|recommended)(?::\s*|$))?(?:(?P<label>[^:]{2,40}):\s*(?P<value>.+))?",
+    re.IGNORECASE,
+)
+SEGMENT_SEPARATOR_RE = re.compile(r"\s*,\s*")
 
 
 def create_requirement() -> dict:
@@ -32,8 +53,8 @@ def clean_text(value) -> str | None:
 
     text = unescape(str(value))
     text = text.replace("\r", "\n").replace("\xa0", " ")
-    text = re.sub(r"[ \t]+", " ", text)
-    text = re.sub(r"\n{3,}", "\n\n", text)
+    text = INLINE_SPACE_RE.sub(" ", text)
+    text = EXTRA_BLANK_LINES_RE.sub("\n\n", text)
     text = text.strip()
     if NULLISH_RE.fullmatch(text):
         return None
@@ -45,18 +66,13 @@ def strip_html(html: str | None) -> str:
         return ""
 
     text = str(html)
-    text = re.sub(r"<br\s*/?>", "\n", text, flags=re.IGNORECASE)
-    text = re.sub(r"</p>", "\n", text, flags=re.IGNORECASE)
-    text = re.sub(r"</li>", "\n", text, flags=re.IGNORECASE)
-    text = re.sub(r"</ul>", "\n", text, flags=re.IGNORECASE)
-    text = re.sub(r"<li[^>]*>", "", text, flags=re.IGNORECASE)
-    text = re.sub(r"<[^>]+>", "", text)
+    text = HTML_TAG_RE.sub(lambda match: "\n" if match.group(1) else "", text)
     return clean_text(text) or ""
 
 
 def normalize_label(text: str | None) -> str:
     cleaned = (clean_text(text) or "").lower()
-    return re.sub(r"[^a-z0-9]+", " ", cleaned).strip()
+    return LABEL_SEPARATOR_RE.sub(" ", cleaned).strip()
 
 
 def normalize_number(value) -> float | None:
@@ -69,8 +85,11 @@ def normalize_number(value) -> float | None:
 
 
 def parse_size_in_gb(text: str | None) -> float | None:
-    normalized = (clean_text(text) or "").lower()
-    match = re.search(r"(\d+(?:\.\d+)?)\s*(tb|gb|mb)\b", normalized)
+    return parse_lowered_size_in_gb((clean_text(text) or "").lower())
+
+
+def parse_lowered_size_in_gb(normalized: str) -> float | None:
+    match = SIZE_RE.search(normalized)
     if not match:
         return None
 
@@ -87,9 +106,9 @@ def parse_graphics_memory_gb(text: str | None) -> float | None:
     normalized = (clean_text(text) or "").lower()
     if not normalized:
         return None
-    if not re.search(r"\b(vram|video memory|video card|graphics|graphic card|dedicated)\b", normalized):
+    if not GRAPHICS_MEMORY_RE.search(normalized):
         return None
-    return parse_size_in_gb(normalized)
+    return parse_lowered_size_in_gb(normalized)
 
 
 def update_graphics_api_fields(req: dict, text: str | None) -> None:
@@ -97,15 +116,18 @@ def update_graphics_api_fields(req: dict, text: str | None) -> None:
     if not normalized:
         return
 
-    directx_match = re.search(r"(directx|direct3d)\s*([0-9]+(?:\.[0-9]+)?)", normalized, re.IGNORECASE)
-    if directx_match and req["directx"] is None:
-        req["directx"] = normalize_number(directx_match.group(2))
-
-    opengl_match = re.search(r"opengl\s*([0-9]+(?:\.[0-9]+)?)", normalized, re.IGNORECASE)
-    if opengl_match and req["opengl"] is None:
-        req["opengl"] = normalize_number(opengl_match.group(1))
-
-    if re.search(r"\bvulkan\b", normalized, re.IGNORECASE):
+    lowered = normalized.lower()
+    # "rect", not "direct": re.IGNORECASE also lets "ı" and "İ" match "i".
+    if "rect" in lowered or "opengl" in lowered:
+        for match in GRAPHICS_API_RE.finditer(normalized):
+            directx, opengl = match.groups()
+            if directx is not None:
+                if req["directx"] is None:
+                    req["directx"] = normalize_number(directx)
+            elif req["opengl"] is None:
+                req["opengl"] = normalize_number(opengl)
+
+    if not req["vulkan"] and "vulkan" in lowered and VULKAN_RE.search(normalized):
         req["vulkan"] = True
 
 
@@ -120,23 +142,23 @@ def choose_better_text(current: str | None, new_value: str | None) -> str | None
 
 
 def looks_like_os(text: str | None) -> bool:
-    return bool(re.search(r"windows|linux|ubuntu|steamos|mac ?os|os x|sierra|mojave|catalina|ventura", text or "", re.IGNORECASE))
+    return bool(OS_HINT_RE.search(text or ""))
 
 
 def looks_like_cpu(text: str | None) -> bool:
-    return bool(re.search(r"processor|cpu|intel|amd|ryzen|athlon|pentium|celeron|xeon|core [im\d]|dual[\s-]?core|quad[\s-]?core|ghz|mhz", text or "", re.IGNORECASE))
+    return bool(CPU_HINT_RE.search(text or ""))
 
 
 def looks_like_gpu(text: str | None) -> bool:
-    return bool(re.search(r"graphics|gpu|video card|video memory|vram|geforce|radeon|gtx|rtx|rx\s*\d|intel hd|iris|arc|nvidia|amd hd|directx|direct3d|opengl|shader|pci|agp", text or "", re.IGNORECASE))
+    return bool(GPU_HINT_RE.search(text or ""))
 
 
 def looks_like_ram(text: str | None) -> bool:
-    return bool(re.search(r"\b(memory|ram)\b", text or "", re.IGNORECASE))
+    return bool(RAM_HINT_RE.search(text or ""))
 
 
 def looks_like_storage(text: str | None) -> bool:
-    return bool(re.search(r"storage|hard drive|hard disk|disk space|drive space|available space|free space", text or "", re.IGNORECASE))
+    return bool(STORAGE_HINT_RE.search(text or ""))
 
 
 def split_combined_levels(raw_html: str | None) -> dict:
@@ -144,8 +166,7 @@ def split_combined_levels(raw_html: str | None) -> dict:
         return {}
 
     text = str(raw_html)
-    pattern = re.compile(r"(?:<strong>\s*)?(Minimum|Recommended)\s*:?\s*(?:</strong>)?", re.IGNORECASE)
-    matches = list(pattern.finditer(text))
+    matches = list(LEVEL_HEADING_RE.finditer(text))
     if not matches:
         return {}
 
@@ -245,22 +266,20 @@ def parse_requirement_block(raw_html: str | None) -> dict:
     if not stripped:
         return req
 
-    lines = [
-        clean_text(line)
-        for line in stripped.split("\n")
-    ]
-    lines = [
-        line for line in lines
-        if line and not re.fullmatch(r"(minimum|recommended):?", line, flags=re.IGNORECASE)
-    ]
-
-    for line in lines:
-        line = re.sub(r"^(minimum|recommended):\s*", "", line, flags=re.IGNORECASE)
-        labeled = re.match(r"^([^:]{2,40}):\s*(.+)$", line)
-        if labeled and assign_from_label(req, labeled.group(1), labeled.group(2)):
+    for raw_line in stripped.split("\n"):
+        line = clean_text(raw_line)
+        if not line:
             continue
 
-        segments = [clean_text(part) for part in re.split(r"\s*,\s*", line)]
+        parts = REQUIREMENT_LINE_RE.match(line)
+        if parts.group("level"):
+            line = line[parts.end("level"):]
+            if not line:
+                continue
+        if parts.group("label") and assign_from_label(req, parts.group("label"), parts.group("value")):
+            continue
+
+        segments = [clean_text(part) for part in SEGMENT_SEPARATOR_RE.split(line)]
         for segment in segments:
             if segment:
                 parse_freeform_line(req, segment)
@@ -271,6 +290,14 @@ def parse_requirement_block(raw_html: str | None) -> dict:
     return req
 
 
+def has_requirement_markup(field) -> bool:
+    if isinstance(field, str):
+        return bool(field)
+    if isinstance(field, dict):
+        return bool(field.get("minimum") or field.get("recommended"))
+    return False
+
+
 def parse_requirements_field(field) -> dict:
     direct_minimum = field.get("minimum") if isinstance(field, dict) else None
     direct_recommended = field.get("recommended") if isinstance(field, dict) else None